@@ -191,10 +191,11 @@ class StandardizedMemoProcessor:
             if not structure.total_chunks:
                 raise ValueError("Chunked message missing total_chunks")
                 
-            # Verify we have all chunks
-            chunk_indices = group.chunk_indices
-            if len(chunk_indices) != structure.total_chunks:
-                raise ValueError(f"Missing chunks. Have {len(chunk_indices)}/{structure.total_chunks}")
+            # Verify we have all chunks. Check against the structure parsed
+            # from the first memo rather than group.missing_chunks, since
+            # hand-built groups may not carry a structure
+            if group.chunk_count != structure.total_chunks:
+                raise ValueError(f"Missing chunks. Have {group.chunk_count}/{structure.total_chunks}")
                 
             # Sort and join chunks
             sorted_msgs = sorted(
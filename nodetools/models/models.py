@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Set, Optional, Dict, Any, Pattern, TYPE_CHECKING, List
 from enum import Enum
 from loguru import logger
@@ -28,6 +29,23 @@ class MemoDataStructureType(Enum):
     CHUNK = "c"     # Chunking
     NONE = "-"      # No processing
 
+# Single-character markers from MemoDataStructureType, bound once so the
+# per-transaction parsing paths don't repeat enum .value lookups
+_ECDH_MARKER = MemoDataStructureType.ECDH.value
+_BROTLI_MARKER = MemoDataStructureType.BROTLI.value
+
+# Combined grammar for the standardized memo_format (markers as in
+# MemoDataStructureType): one fully anchored pass both validates the format
+# and extracts every field via named groups, so validation and parsing never
+# need separate scans. Compiled once at import time, as is the legacy chunk
+# prefix pattern below.
+_FORMAT_RE = re.compile(
+    r'^(?P<encryption>[e\-])\.'
+    r'(?P<compression>[b\-])\.'
+    r'(?:-|c(?P<chunk_index>\d+)/(?P<total_chunks>\d+))$'
+)
+_LEGACY_CHUNK_RE = re.compile(r'^chunk_(\d+)__')
+
 @dataclass
 class Dependencies:
     """Container for core dependencies that can be provided by NodeTools"""
@@ -40,7 +58,7 @@ class Dependencies:
     message_encryption: 'MessageEncryption'
     openai: 'OpenAIRequestTool'
 
-@dataclass
+@dataclass(slots=True)
 class MemoStructure:
     """Describes how a memo is structured across transactions"""
     is_chunked: bool
@@ -67,55 +85,17 @@ class MemoStructure:
         """
         if not memo_format:
             return False
-        
-        parts = memo_format.split(".")
-        if len(parts) != 3:
-            return False
-        
-        encryption, compression, chunking = parts
 
-        # Validate encryption part
-        if encryption not in {MemoDataStructureType.ECDH.value, MemoDataStructureType.NONE.value}:
-            return False
-            
-        # Validate compression part
-        if compression not in {MemoDataStructureType.BROTLI.value, MemoDataStructureType.NONE.value}:
-            return False
-            
-        # Validate chunking part
-        if chunking != MemoDataStructureType.NONE.value:
-            chunk_match = re.match(fr'{MemoDataStructureType.CHUNK.value}\d+/\d+', chunking)
-            if not chunk_match:
-                return False
-                
-        return True
+        return _FORMAT_RE.match(memo_format) is not None
     
     @classmethod
     def parse_standardized_format(cls, memo_format: str) -> 'MemoStructure':
         """Parse a validated standardized memo_format string."""
-        encryption, compression, chunking = memo_format.split(".")
+        fields = _standardized_format_fields(memo_format)
+        if fields is None:
+            raise ValueError(f"Not a standardized memo_format: {memo_format}")
 
-        # Parse encryption
-        encryption_type = (
-            MemoDataStructureType.ECDH if encryption == MemoDataStructureType.ECDH.value 
-            else None
-        )
-        
-        # Parse compression
-        compression_type = (
-            MemoDataStructureType.BROTLI if compression == MemoDataStructureType.BROTLI.value 
-            else None
-        )
-        
-        # Parse chunking
-        chunk_index = None
-        total_chunks = None
-        if chunking != MemoDataStructureType.NONE.value:
-            chunk_match = re.match(fr'{MemoDataStructureType.CHUNK.value}(\d+)/(\d+)', chunking)
-            if chunk_match:  # We know this matches from validation
-                chunk_index = int(chunk_match.group(1))
-                total_chunks = int(chunk_match.group(2))
-        
+        encryption_type, compression_type, chunk_index, total_chunks = fields
         return cls(
             is_chunked=chunk_index is not None,
             chunk_index=chunk_index,
@@ -153,34 +133,98 @@ class MemoStructure:
         memo_data = tx.get("memo_data", "")
         memo_format = tx.get("memo_format")
 
-        # Check if using standardized format
-        if cls.is_standardized_memo_format(memo_format):
-            structure = cls.parse_standardized_format(memo_format)
-            structure.group_id = tx.get("memo_type")  # Set group_id from transaction
-            return structure
+        # Memoize on the tx dict: groups re-derive structure for the same tx
+        # many times (duplicate detection, chunk_indices, sorting), so cache
+        # the parse keyed on the memo fields it was derived from. The identity
+        # check on memo_data invalidates the cache when a tx copy is given a
+        # new memo_data (e.g. after group processing).
+        cached = tx.get("_memo_structure")
+        if cached is not None:
+            cached_format, cached_data, structure = cached
+            if cached_format == memo_format and cached_data is memo_data:
+                return structure
+
+        structure = cls._parse_memo_fields(tx.get("memo_type"), memo_data, memo_format)
+        tx["_memo_structure"] = (memo_format, memo_data, structure)
+        return structure
+
+    @classmethod
+    def _parse_memo_fields(
+        cls,
+        group_id: Optional[str],
+        memo_data: str,
+        memo_format: Optional[str]
+    ) -> 'MemoStructure':
+        """Parse memo structure from the unpacked memo fields."""
+        # Check if using standardized format. Parsing is cached per unique
+        # memo_format string, so only tx-specific fields are filled in here.
+        fields = _standardized_format_fields(memo_format) if memo_format else None
+        if fields is not None:
+            encryption_type, compression_type, chunk_index, total_chunks = fields
+            return cls(
+                is_chunked=chunk_index is not None,
+                chunk_index=chunk_index,
+                total_chunks=total_chunks,
+                group_id=group_id,
+                compression_type=compression_type,
+                encryption_type=encryption_type,
+                is_standardized_format=True
+            )
 
         ## Backwards compatibility for legacy format
-        # Fall back to legacy prefix detection
-        chunk_match = re.match(r'^chunk_(\d+)__', memo_data)
-        
+        # Fall back to legacy prefix detection, cached on the short prefix
+        # that can contain the chunk marker
+        chunk_index = _legacy_chunk_index(memo_data[:_LEGACY_PREFIX_LEN])
+
         # Only check compression on first chunk
         is_compressed = (
-            "COMPRESSED__" in memo_data 
-            if chunk_match and chunk_match.group(1) == "1" 
+            "COMPRESSED__" in memo_data
+            if chunk_index == 1
             else None  # Unknown for other chunks
         )
 
         return cls(
-            is_chunked=chunk_match is not None,
-            chunk_index=int(chunk_match.group(1)) if chunk_match else None,
+            is_chunked=chunk_index is not None,
+            chunk_index=chunk_index,
             total_chunks=None,  # Legacy format doesn't specify total chunks
-            group_id=tx.get("memo_type"),
+            group_id=group_id,
             compression_type=MemoDataStructureType.BROTLI if is_compressed else None,
             encryption_type=None,  # Will be determined after processing
             is_standardized_format=False
         )
-    
-@dataclass
+
+# Legacy chunk markers look like "chunk_<digits>__"; this prefix length is
+# comfortably past any realistic chunk number, keeping the cache key small
+_LEGACY_PREFIX_LEN = 20
+
+@lru_cache(maxsize=1024)
+def _standardized_format_fields(memo_format: str) -> Optional[tuple]:
+    """
+    Parse a memo_format string once per process.
+    Returns (encryption_type, compression_type, chunk_index, total_chunks)
+    for standardized formats, or None if the format is not standardized.
+    """
+    format_match = _FORMAT_RE.match(memo_format)
+    if format_match is None:
+        return None
+
+    chunk_index = format_match['chunk_index']
+    total_chunks = format_match['total_chunks']
+    return (
+        MemoDataStructureType.ECDH if format_match['encryption'] == _ECDH_MARKER else None,
+        MemoDataStructureType.BROTLI if format_match['compression'] == _BROTLI_MARKER else None,
+        int(chunk_index) if chunk_index is not None else None,
+        int(total_chunks) if total_chunks is not None else None
+    )
+
+@lru_cache(maxsize=1024)
+def _legacy_chunk_index(memo_data_prefix: str) -> Optional[int]:
+    """Extract the legacy chunk index from a memo_data prefix, if present"""
+    chunk_match = _LEGACY_CHUNK_RE.match(memo_data_prefix)
+    return int(chunk_match.group(1)) if chunk_match else None
+
+
+@dataclass(slots=True)
 class MemoGroup:
     """
     Manages a group of related memos from individual transactions.
@@ -191,13 +235,26 @@ class MemoGroup:
     group_id: str
     memos: List[Dict[str, Any]]
     structure: Optional[MemoStructure] = None
+    _by_chunk_index: Dict[int, Dict[str, Any]] = field(init=False, repr=False, compare=False)
+    _chunk_indices_cache: Optional[frozenset] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Index memos by chunk index for O(1) duplicate detection and
+        # chunk accounting, kept in sync with self.memos. The chunk_indices
+        # frozenset is built lazily from the index and invalidated on insert.
+        self._by_chunk_index = {}
+        self._chunk_indices_cache = None
+        for memo in self.memos:
+            chunk_index = MemoStructure.from_transaction(memo).chunk_index
+            if chunk_index is not None:
+                self._by_chunk_index[chunk_index] = memo
 
     @classmethod
     def create_from_transaction(cls, tx: Dict[str, Any]) -> 'MemoGroup':
         """Create a new message group from an initial transaction"""
         structure = MemoStructure.from_transaction(tx)
         return cls(
-            group_id=tx.get("memo_type"),
+            group_id=structure.group_id,
             memos=[tx],
             structure=structure,
         )
@@ -231,38 +288,55 @@ class MemoGroup:
             if not self._is_structure_consistent(new_structure):
                 logger.warning(f"Inconsistent message structure in group {self.group_id}")
                 return False
-            self.memos.append(tx)
+            self._append_memo(tx, new_structure.chunk_index)
             return True
-        
+
         # For legacy format messages, handle duplicate chunks
         if new_structure.chunk_index is not None:
-            # Find any existing memo with the same chunk index
-            existing_memo = next(
-                (memo for memo in self.memos 
-                if MemoStructure.from_transaction(memo).chunk_index == new_structure.chunk_index),
-                None
-            )
-            
+            # Check the chunk index for an existing memo with the same index
+            existing_memo = self._by_chunk_index.get(new_structure.chunk_index)
+
             if existing_memo:
                 # If we found a duplicate chunk, only replace if new tx has earlier datetime
                 if tx.get('datetime') < existing_memo.get('datetime'):
                     self.memos.remove(existing_memo)
-                    self.memos.append(tx)
+                    self._append_memo(tx, new_structure.chunk_index)
                     return True
                 return False  # Duplicate chunk with later datetime, ignore it
-        
+
         # No duplicate found, add the new memo
-        self.memos.append(tx)
+        self._append_memo(tx, new_structure.chunk_index)
         return True
+
+    def _append_memo(self, tx: Dict[str, Any], chunk_index: Optional[int]) -> None:
+        """Append a memo and keep the chunk index in sync"""
+        self.memos.append(tx)
+        if chunk_index is not None:
+            self._by_chunk_index[chunk_index] = tx
+            self._chunk_indices_cache = None
         
     @property
     def chunk_indices(self) -> Set[int]:
         """Get set of available chunk indices"""
-        return {
-            MemoStructure.from_transaction(tx).chunk_index
-            for tx in self.memos
-            if MemoStructure.from_transaction(tx).chunk_index is not None
-        }
+        if self._chunk_indices_cache is None:
+            self._chunk_indices_cache = frozenset(self._by_chunk_index.keys())
+        return self._chunk_indices_cache
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of distinct chunks received so far"""
+        return len(self._by_chunk_index)
+
+    @property
+    def missing_chunks(self) -> Optional[int]:
+        """
+        Number of chunks still outstanding, or None when unknown
+        (legacy groups don't declare total_chunks).
+        The chunk index already tracks distinct chunks, so this is O(1).
+        """
+        if self.structure is None or self.structure.total_chunks is None:
+            return None
+        return self.structure.total_chunks - len(self._by_chunk_index)
     
 class StructuralPattern(Enum):
     """
@@ -277,21 +351,49 @@ class StructuralPattern(Enum):
     @staticmethod
     def match(tx: Dict[str, Any]) -> str:
         """Determine how a transaction's memos should be handled"""
-        if not bool(tx.get('has_memos')):
-            return StructuralPattern.NO_MEMO
+        # Fast path: most transactions carry no memos at all, so bail out on
+        # a single truthiness check before touching any other field
+        if not tx.get('has_memos'):
+            return _NO_MEMO
+
+        memo_data = tx.get('memo_data', '')
+        memo_format = tx.get('memo_format')
+
+        # Without a memo_format the tx can't be standardized, so classify it
+        # from memo_data alone without building a MemoStructure
+        if not memo_format:
+            return _NEEDS_LEGACY_GROUPING if "chunk_" in memo_data else _DIRECT_MATCH
+
+        # Reuse a prior result for this tx if its memo fields are unchanged,
+        # mirroring the MemoStructure.from_transaction cache
+        cached = tx.get('_structural_pattern')
+        if cached is not None:
+            cached_format, cached_data, result = cached
+            if cached_format == memo_format and cached_data is memo_data:
+                return result
 
-        # Check if there is no memo present
         structure = MemoStructure.from_transaction(tx)
         if structure.is_standardized_format:
             # New format: Use metadata to determine grouping needs
-            return StructuralPattern.NEEDS_GROUPING if structure.is_chunked else StructuralPattern.DIRECT_MATCH
+            result = _NEEDS_GROUPING if structure.is_chunked else _DIRECT_MATCH
         else:
             # Legacy format: Check for chunk prefix
-            if "chunk_" in tx.get('memo_data', ''):
-                return StructuralPattern.NEEDS_LEGACY_GROUPING
-            return StructuralPattern.DIRECT_MATCH
-
-@dataclass(frozen=True)  # Making it immutable for hashability
+            if "chunk_" in memo_data:
+                result = _NEEDS_LEGACY_GROUPING
+            else:
+                result = _DIRECT_MATCH
+
+        tx['_structural_pattern'] = (memo_format, memo_data, result)
+        return result
+
+# Member lookups on an Enum class go through the metaclass; bind the members
+# once so StructuralPattern.match avoids that on every transaction
+_NO_MEMO = StructuralPattern.NO_MEMO
+_DIRECT_MATCH = StructuralPattern.DIRECT_MATCH
+_NEEDS_GROUPING = StructuralPattern.NEEDS_GROUPING
+_NEEDS_LEGACY_GROUPING = StructuralPattern.NEEDS_LEGACY_GROUPING
+
+@dataclass(frozen=True, slots=True)  # Making it immutable for hashability
 class MemoPattern:
     """
     Defines patterns for matching processed XRPL memos.
@@ -300,6 +402,49 @@ class MemoPattern:
     memo_type: Optional[str | Pattern] = None
     memo_format: Optional[str | Pattern] = None
     memo_data: Optional[str | Pattern] = None
+    # Derived attributes, computed once in __post_init__
+    _hash: int = field(init=False, repr=False, compare=False)
+    _field_checks: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Patterns are immutable, so the hash can be computed once up front.
+        # Patterns are hashed frequently as dict keys and set members
+        # (memo_pattern_to_id, valid_responses).
+        # Convert Pattern objects to their pattern strings for hashing
+        memo_type_hash = self.memo_type.pattern if isinstance(self.memo_type, Pattern) else self.memo_type
+        memo_format_hash = self.memo_format.pattern if isinstance(self.memo_format, Pattern) else self.memo_format
+        memo_data_hash = self.memo_data.pattern if isinstance(self.memo_data, Pattern) else self.memo_data
+        object.__setattr__(self, '_hash', hash((memo_type_hash, memo_format_hash, memo_data_hash)))
+
+        # Resolve each field to a matcher callable up front so matches()
+        # doesn't re-dispatch on isinstance per transaction: compiled
+        # patterns match by regex, plain strings by equality. Checks are
+        # ordered most-selective first so mismatches short-circuit early:
+        # exact strings before regexes, and memo_format (shared by most
+        # transactions) last.
+        checks = []
+        for tx_key, pattern in (
+            ("memo_type", self.memo_type),
+            ("memo_data", self.memo_data),
+            ("memo_format", self.memo_format),
+        ):
+            if pattern is not None:
+                selectivity = 0 if isinstance(pattern, str) else 1
+                checks.append((selectivity, tx_key, self._make_matcher(pattern)))
+        checks.sort(key=lambda check: check[0])
+        object.__setattr__(
+            self, '_field_checks',
+            tuple((tx_key, matcher) for _, tx_key, matcher in checks)
+        )
+
+    @staticmethod
+    def _make_matcher(pattern: Optional[str | Pattern]):
+        """Build a value -> bool callable for a pattern field, or None if unset"""
+        if pattern is None:
+            return None
+        if isinstance(pattern, Pattern):
+            return pattern.match
+        return lambda value, _pattern=pattern: _pattern == value
 
     def get_message_structure(self, tx: Dict[str, Any]) -> MemoStructure:
         """Extract structural information from the memo fields"""
@@ -307,35 +452,14 @@ class MemoPattern:
 
     def matches(self, tx: Dict[str, Any]) -> bool:
         """Check if a transaction's memo matches this pattern"""
-        if self.memo_type:
-            tx_memo_type = tx.get("memo_type")
-            if not tx_memo_type or not self._pattern_matches(self.memo_type, tx_memo_type):
+        for tx_key, matcher in self._field_checks:
+            value = tx.get(tx_key)
+            if not value or not matcher(value):
                 return False
-
-        if self.memo_format:
-            tx_memo_format = tx.get("memo_format")
-            if not tx_memo_format or not self._pattern_matches(self.memo_format, tx_memo_format):
-                return False
-
-        if self.memo_data:
-            tx_memo_data = tx.get("memo_data")
-            if not tx_memo_data or not self._pattern_matches(self.memo_data, tx_memo_data):
-                return False
-
         return True
 
-    def _pattern_matches(self, pattern: str | Pattern, value: str) -> bool:
-        if isinstance(pattern, Pattern):
-            return bool(pattern.match(value))
-        return pattern == value
-    
     def __hash__(self):
-        # Convert Pattern objects to their pattern strings for hashing
-        memo_type_hash = self.memo_type.pattern if isinstance(self.memo_type, Pattern) else self.memo_type
-        memo_format_hash = self.memo_format.pattern if isinstance(self.memo_format, Pattern) else self.memo_format
-        memo_data_hash = self.memo_data.pattern if isinstance(self.memo_data, Pattern) else self.memo_data
-        
-        return hash((memo_type_hash, memo_format_hash, memo_data_hash))
+        return self._hash
     
     def __eq__(self, other):
         if not isinstance(other, MemoPattern):
@@ -351,7 +475,7 @@ class MemoPattern:
                 compare_attrs(self.memo_format, other.memo_format) and
                 compare_attrs(self.memo_data, other.memo_data))
 
-@dataclass
+@dataclass(slots=True)
 class InteractionPattern:
     memo_pattern: MemoPattern
     transaction_type: InteractionType
@@ -370,6 +494,65 @@ class InteractionGraph:
     def __init__(self):
         self.patterns: Dict[str, InteractionPattern] = {}
         self.memo_pattern_to_id: Dict[MemoPattern, str] = {}
+        # Prefiltered candidate lists for find_matching_pattern: for each
+        # exact-string memo_type, a flat insertion-ordered list of
+        # (pattern_id, memo_pattern) pairs containing the patterns registered
+        # for that memo_type plus every pattern with a regex (or absent)
+        # memo_type. Transactions then scan one small contiguous list
+        # instead of the whole pattern dict. The fallback list holds only the
+        # regex/absent-memo_type patterns, for txs whose memo_type has no
+        # exact-match patterns.
+        self._candidates_by_type: Dict[str, List[tuple]] = {}
+        self._fallback_candidates: List[tuple] = []
+        # Per-REQUEST-pattern response candidates, indexed the same way:
+        # pattern_id -> (exact memo_type -> candidates, fallback candidates)
+        self._response_index: Dict[str, tuple] = {}
+
+    def _rebuild_pattern_index(self) -> None:
+        """Rebuild the per-memo_type candidate lists from self.patterns"""
+        exact_entries: Dict[str, List[tuple]] = {}
+        unindexed_entries: List[tuple] = []
+        for seq, (pattern_id, pattern) in enumerate(self.patterns.items()):
+            memo_pattern = pattern.memo_pattern
+            if isinstance(memo_pattern.memo_type, str):
+                exact_entries.setdefault(memo_pattern.memo_type, []).append(
+                    (seq, pattern_id, memo_pattern)
+                )
+            else:
+                unindexed_entries.append((seq, pattern_id, memo_pattern))
+
+        self._fallback_candidates = [
+            (pattern_id, memo_pattern) for _, pattern_id, memo_pattern in unindexed_entries
+        ]
+        self._candidates_by_type = {
+            memo_type: [
+                (pattern_id, memo_pattern)
+                for _, pattern_id, memo_pattern in sorted(entries + unindexed_entries)
+            ]
+            for memo_type, entries in exact_entries.items()
+        }
+
+        self._response_index = {
+            pattern_id: self._index_response_patterns(pattern.valid_responses)
+            for pattern_id, pattern in self.patterns.items()
+            if pattern.transaction_type == InteractionType.REQUEST
+        }
+
+    @staticmethod
+    def _index_response_patterns(valid_responses: Set[MemoPattern]) -> tuple:
+        """Index a pattern's valid responses by exact memo_type"""
+        by_type: Dict[str, List[MemoPattern]] = {}
+        wildcard: List[MemoPattern] = []
+        for resp_pattern in valid_responses:
+            if isinstance(resp_pattern.memo_type, str):
+                by_type.setdefault(resp_pattern.memo_type, []).append(resp_pattern)
+            else:
+                wildcard.append(resp_pattern)
+        candidates_by_type = {
+            memo_type: patterns + wildcard
+            for memo_type, patterns in by_type.items()
+        }
+        return candidates_by_type, wildcard
 
     def add_pattern(
             self,
@@ -392,30 +575,41 @@ class InteractionGraph:
             notify: Whether transactions matching this pattern should trigger notifications
         """
         self.patterns[pattern_id] = InteractionPattern(
-            memo_pattern=memo_pattern, 
-            transaction_type=transaction_type, 
-            valid_responses=valid_responses,
+            memo_pattern=memo_pattern,
+            transaction_type=transaction_type,
+            # Freeze so the precomputed response index can't drift from the set
+            valid_responses=frozenset(valid_responses) if valid_responses else valid_responses,
             notify=notify
         )
-        # Update the reverse lookup
+        # Update the reverse lookup and prefilter buckets
         self.memo_pattern_to_id[memo_pattern] = pattern_id
+        self._rebuild_pattern_index()
 
     def is_valid_response(self, request_pattern_id: str, response_tx: Dict[str, Any]) -> bool:
-        if request_pattern_id not in self.patterns:
-            return False
-        
-        pattern = self.patterns[request_pattern_id]
-        if pattern.transaction_type != InteractionType.REQUEST:
+        indexed = self._response_index.get(request_pattern_id)
+        if indexed is None:  # Unknown pattern_id or not a REQUEST type
             return False
 
-        return any(resp_pattern.matches(response_tx) for resp_pattern in pattern.valid_responses)
+        candidates_by_type, wildcard = indexed
+        tx_memo_type = response_tx.get("memo_type")
+        if tx_memo_type:
+            candidates = candidates_by_type.get(tx_memo_type, wildcard)
+        else:
+            candidates = wildcard
+
+        return any(resp_pattern.matches(response_tx) for resp_pattern in candidates)
 
     def find_matching_pattern(self, tx: Dict[str, Any]) -> Optional[str]:
         """Find the first pattern ID whose pattern matches the transaction"""
-        for pattern_id, pattern in self.patterns.items():
-            if pattern.memo_pattern.matches(tx):
+        tx_memo_type = tx.get("memo_type")
+        if tx_memo_type:
+            candidates = self._candidates_by_type.get(tx_memo_type, self._fallback_candidates)
+        else:
+            candidates = self._fallback_candidates
+
+        for pattern_id, memo_pattern in candidates:
+            if memo_pattern.matches(tx):
                 return pattern_id
-            continue
         return None
     
     def get_pattern_id_by_memo_pattern(self, memo_pattern: MemoPattern) -> Optional[str]:
@@ -185,12 +185,12 @@ class TransactionReviewer:
         structure = group.structure
 
         # For standardized format, only attempting processing when we have all chunks
-        if is_standardized and len(group.chunk_indices) < structure.total_chunks:
+        if is_standardized and group.chunk_count < structure.total_chunks:
             return ReviewingResult(
                 tx=tx,
                 processed=False,
                 rule_name="NoRule",
-                notes=f"Waiting for more chunks ({len(group.chunk_indices)}/{structure.total_chunks})"
+                notes=f"Waiting for more chunks ({group.chunk_count}/{structure.total_chunks})"
             )
         
         # Try processing the group